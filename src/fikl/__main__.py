@@ -39,7 +39,8 @@ def main():
 
     config = load_yaml(*args.config)
     decision = Decision(config=config, raw_path=args.data)
-    report(decision, args.output)
+    # only bother making the html human readable when debugging
+    report(decision, args.output, pretty=args.debug)
 
 
 if __name__ == "__main__":
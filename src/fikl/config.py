@@ -6,9 +6,6 @@ from fikl.proto import config_pb2
 from fikl.util import load_yamls as dict_from_yamls
 
 import os
-import yaml
-import json
-import tempfile
 import logging
 from typing import List
 
@@ -1,4 +1,4 @@
-from fikl.scorers import ScorerInfo, get_scorer_info_from_config
+from fikl.scorers import ScorerInfo, get_scorer_info_from_config, score_all
 from fikl.proto import config_pb2
 from fikl.graph import create_graph
 from fikl.fetchers import fetch
@@ -40,7 +40,12 @@ def _get_source_data(config: config_pb2.Config, raw_path: str) -> pd.DataFrame:
 
     # allow the user to input executable code in the csv. eval it here.
     # FIXME: this is deeply unsafe. need to find a better way to do this.
-    raw = raw.map(lambda x: eval(x) if isinstance(x, str) else x)
+    # only text columns can hold code, and each distinct expression is compiled and evaluated once,
+    # no matter how many cells it appears in.
+    for col in raw.columns[raw.dtypes == object]:
+        exprs = raw[col].unique()
+        values = {x: eval(compile(x, "<csv>", "eval")) for x in exprs if isinstance(x, str)}
+        raw[col] = raw[col].map(lambda x: values[x] if isinstance(x, str) else x)
 
     # set of all requested sources from the config
     req_sources = set([measure.source for measure in config.measures])
@@ -81,12 +86,7 @@ def _get_measure_data(source_data: pd.DataFrame, scorer_info: list[ScorerInfo])
         the measure data
     """
     # for each measure, compute the value for each choice
-    measure_data = pd.DataFrame(
-        index=source_data.index, columns=[entry.measure for entry in scorer_info]
-    )
-    for entry in scorer_info:
-        measure_data[entry.measure] = entry.scorer(source_data[entry.source])
-    return measure_data
+    return score_all(source_data, scorer_info)
 
 
 def _get_weights(config: config_pb2.Config) -> pd.DataFrame:
@@ -107,16 +107,21 @@ def _get_weights(config: config_pb2.Config) -> pd.DataFrame:
     """
     measure_names = [measure.name for measure in config.measures]
     metric_names = [metric.name for metric in config.metrics]
-    weights = pd.DataFrame(
-        0,
-        index=pd.Index(metric_names, name="metric", dtype="object"),
-        columns=measure_names + metric_names,
-    )
+    factor_names = measure_names + metric_names
+    # column index of each factor, so that the raw weights can be filled in without going through
+    # a pandas indexer for every (metric, factor) pair
+    factor_idxs = {name: i for i, name in enumerate(factor_names)}
+    raw_weights = np.zeros((len(metric_names), len(factor_names)), dtype=np.float64)
     # for each metric, set the raw weights for each factor
-    for metric in config.metrics:
+    for metric_idx, metric in enumerate(config.metrics):
         for factor in metric.factors:
             # a factor may be a measure or a metric
-            weights.loc[metric.name, factor.name] = factor.weight
+            raw_weights[metric_idx, factor_idxs[factor.name]] = factor.weight
+    weights = pd.DataFrame(
+        raw_weights,
+        index=pd.Index(metric_names, name="metric", dtype="object"),
+        columns=factor_names,
+    )
     # normalize the weights for each metric (along each row)
     weights = weights.div(weights.sum(axis=1), axis=0)
     return weights
@@ -295,14 +300,16 @@ class Decision:
     def sources_table(self) -> pd.DataFrame:
         """
         Get the source table. This is the raw data that was input by the user, plus any data that
-        was fetched. The index is the choice name, the columns are the sources.
+        was fetched. The index is the choice name, the columns are the sources. A source that is
+        used by more than one measure only appears once.
 
         Returns
         -------
         pd.DataFrame
             the source table
         """
-        return self.data[self.sources()]
+        # select each source only once, rather than selecting duplicates and dropping them after
+        return self.data[list(dict.fromkeys(self.sources()))]
 
     def measures_table(self) -> pd.DataFrame:
         """
@@ -402,11 +409,8 @@ class Decision:
         List[str]
             a list of metrics that were ignored because they were not included in the final metric
         """
-        return [
-            metric
-            for metric in self.metrics()
-            if not nx.has_path(self.graph, metric, self.config.final)
-        ]
+        used = self._final_ancestors()
+        return [metric for metric in self.metrics() if metric not in used]
 
     def ignored_measures(self) -> List[str]:
         """
@@ -418,11 +422,20 @@ class Decision:
         List[str]
             a list of measures that were ignored because they were not included in any metric
         """
-        return [
-            measure
-            for measure in self.measures()
-            if not nx.has_path(self.graph, measure, self.config.final)
-        ]
+        used = self._final_ancestors()
+        return [measure for measure in self.measures() if measure not in used]
+
+    def _final_ancestors(self) -> set:
+        """
+        Get every node in the graph that has a path to the final metric, including the final metric
+        itself. This is one traversal of the graph, rather than one path search per node.
+
+        Returns
+        -------
+        set
+            names of all sources, measures, and metrics that are used by the final metric
+        """
+        return nx.ancestors(self.graph, self.config.final) | {self.config.final}
 
     def final_metric_idx(self) -> int:
         """
@@ -4,26 +4,65 @@ Handle generating HTML content from Jinja2 templates located in src/templates
 from fikl.decision import Decision
 from fikl.util import fill_template, build_ordered_depth_first_tree
 
-import os
+import functools
+import itertools
 import logging
-import bs4
 import re
-import uuid
-from collections import OrderedDict
+import bs4
 from typing import Any, Optional, Union, List
 from inspect import cleandoc
-import tempfile
+from html import escape
 
 import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from markdown import markdown as html_from_md
-
-
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from markdown_it import MarkdownIt
+
+# markdown renderer for docs. commonmark plus tables and strikethrough covers what the docs use from
+# python-markdown's "extra" extension. raw html in the docs is passed through.
+_MARKDOWN = MarkdownIt("commonmark", {"html": True}).enable(["table", "strikethrough"])
+
+# names of heading tags. bs4 matches tag names against a collection with a membership test, which is
+# much cheaper than running a regex against every tag in the document.
+_HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+# opening tag of any heading, for checking whether a document has headings without parsing it
+_HEADING_OPEN_TAG = re.compile(r"<h[1-6]", re.IGNORECASE)
+# prefix for the ids given to headings that don't have one, to keep them apart from any ids the
+# document already uses
+_HEADING_ID_PREFIX = "fikl-h-"
+
+# styles shared by every styled table. the cell properties are the same for every cell, so they are
+# set once for the whole table rather than with set_properties, which would emit a css rule and an id
+# for every single cell.
+_TABLE_STYLES = [
+    {"selector": "th", "props": [("font-family", "Courier")]},
+    {
+        "selector": "td",
+        "props": [
+            ("text-align", "center"),
+            ("font-family", "Courier"),
+            ("font-size", "11px"),
+        ],
+    },
+]
+
+# backgrounds with a relative luminance below this get light text, the same as pandas' default
+_TEXT_COLOR_THRESHOLD = 0.408
+
+# dimensions, in pixels, of the metric weight bar charts
+_CHART_TITLE_HEIGHT = 30
+_CHART_ROW_HEIGHT = 20
+_CHART_BAR_WIDTH = 400
+_CHART_VALUE_WIDTH = 50
+# rough width of a character of label text, used to size the label column
+_CHART_CHAR_WIDTH = 7
+
+
+@functools.lru_cache(maxsize=256)
 def html_from_doc(doc: str) -> str:
     """
-    take an indented markdown string and convert it to html
+    take an indented markdown string and convert it to html. results are cached, since many
+    measures and scorers share the same docs.
 
     Parameters
     ----------
@@ -35,7 +74,7 @@ def html_from_doc(doc: str) -> str:
     str
         html as a string
     """
-    return html_from_md(cleandoc(doc), extensions=["extra"])
+    return _MARKDOWN.render(cleandoc(doc))
 
 
 def prettify(html: str) -> str:
@@ -51,7 +90,7 @@ def prettify(html: str) -> str:
     str
         prettified html
     """
-    return bs4.BeautifulSoup(html, "html.parser").prettify()
+    return bs4.BeautifulSoup(html, "lxml").prettify()
 
 
 def add_toc(html):
@@ -68,103 +107,139 @@ def add_toc(html):
     Returns
     -------
     str
-        HTML content with the table of contents added.
+        HTML content with the table of contents added. If there are no headings, there is nothing to
+        put in a table of contents, and the HTML is returned as is.
     """
+    # a scan of the raw text is much cheaper than parsing, so don't parse a document that can't
+    # have any headings in it
+    if _HEADING_OPEN_TAG.search(html) is None:
+        return html
+    soup = bs4.BeautifulSoup(html, "lxml")
+    # the search can match text that parsing shows isn't a heading, e.g. in a comment. return the
+    # original text in that case, rather than the parser's rewrite of it.
+    if not _add_toc_to_soup(soup):
+        return html
+    return str(soup)
 
-    def _add_items_from_tree(
-        tree: OrderedDict, soup: bs4.BeautifulSoup, current_list: bs4.element.Tag
-    ) -> None:
-        """
-        Recursive function to add items to the table of contents from a tree.
-
-        Parameters
-        ----------
-        tree : OrderedDict
-            Tree to add items from. Keys are (heading name, heading id) tuples, where the heading name is a string that
-            will be displayed in the table of contents, and the heading id is the id of the heading
-            that the table of contents item links to. Values are OrderedDicts that contain the
-            children of the heading. If a heading has no children, then the value is an empty.
-        soup : bs4.BeautifulSoup
-            BeautifulSoup object that contains the HTML content.
-        current_list : bs4.element.Tag
-            BeautifulSoup tag that is the current list to add items to.
-        """
-        for (text, link), children in tree.items():
-            # create the link to the heading
-            heading_link = soup.new_tag("a", href=f"#{link}")
-            heading_link.string = text
-            # create the list item for the table of contents
-            toc_list_item = soup.new_tag("li")
-            toc_list_item.append(heading_link)
-            # add the list item to the table of contents
-            current_list.append(toc_list_item)
-            # if the heading has children, then create a new list and add it to the list item
-            if len(children) > 0:
-                new_list = soup.new_tag("ul")
-                toc_list_item.append(new_list)
-                # call this function recursively to add the children
-                _add_items_from_tree(children, soup, new_list)
-
-    # first parse the html
-    soup = bs4.BeautifulSoup(html, "html.parser")
-
-    # now iterate through the headings and record the title, level, and id. for every heading that
-    # doesn't have an id, create one. along the way, we're building lists of the heading name, levels,
-    # and ids, so that we can build the tree.
-    titles = []
-    levels = []
-    ids = []
-    for heading in soup.find_all(re.compile("h[0-9]{1}")):
-        # if the heading doesn't have an id, create one
-        if heading.get("id") is None:
-            heading["id"] = str(uuid.uuid4())
-        # record the name, level, and id
-        titles.append(heading.get_text())
-        # subtract 1 from the heading level so that the top level is 0
-        levels.append(int(heading.name[1]) - 1)
-        ids.append(heading["id"])
+
+def _add_toc_to_soup(soup: bs4.BeautifulSoup) -> bool:
+    """
+    Same as add_toc(), but modifies an already parsed document in place. This lets callers that
+    need to do more with the document avoid serializing and reparsing it.
+
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        parsed HTML document to add the table of contents to.
+
+    Returns
+    -------
+    bool
+        True if a table of contents was added, False if the document has no headings and was left
+        unchanged.
+    """
+    # find every heading once. the headings are kept so that they can be wrapped in anchors at the
+    # end without searching the whole document for them again.
+    headings = soup.find_all(_HEADING_TAGS)
+    if len(headings) == 0:
+        return False
+    # every heading needs an id for the toc to link to. create one for any heading without one. the
+    # ids only have to be unique within this document, so number them rather than drawing random
+    # ones. this also makes the output the same from run to run. skip any number whose id is
+    # already used somewhere in the document.
+    missing = [heading for heading in headings if heading.get("id") is None]
+    if len(missing) > 0:
+        taken = {tag["id"] for tag in soup.find_all(id=True)}
+        ids_iter = (f"{_HEADING_ID_PREFIX}{i}" for i in itertools.count())
+        free_ids = (new_id for new_id in ids_iter if new_id not in taken)
+        for heading, new_id in zip(missing, free_ids):
+            heading["id"] = new_id
+    # record the title, level, and id of each heading so that we can build the tree. subtract 1
+    # from the heading level so that the top level is 0.
+    titles = [heading.get_text() for heading in headings]
+    levels = [int(heading.name[1]) - 1 for heading in headings]
+    ids = [heading["id"] for heading in headings]
 
     # build the tree
     tree = build_ordered_depth_first_tree(list(zip(titles, ids)), levels)
 
-    # start the toc list
-    toc = soup.new_tag("div", id="toc_div")
-    toc.append(soup.new_tag("h1"))
-    toc.h1.string = "Table of Contents"  # type: ignore
-    # give the toc an id so that we can style it
-    toc.h1["id"] = "toc_h1"  # type: ignore
-    toc_list = soup.new_tag("ul")
-    # limit the height of the toc list to half the screen or shorter and make it scrollable, but if it's too
-    # short, then don't make it scrollable.
-    toc_list["style"] = "overflow-y: scroll; max-height: 50vh;"
-    toc.append(toc_list)
+    # build the whole toc as one html string and parse it once, rather than creating a tag at a
+    # time. the list height is limited to half the screen or shorter and made scrollable, but if
+    # it's short enough, then it isn't scrollable.
+    toc_html = (
+        '<div id="toc_div"><h1 id="toc_h1">Table of Contents</h1>'
+        '<ul style="overflow-y: scroll; max-height: 50vh;">'
+        f"{_toc_items_html(tree)}</ul></div>"
+    )
+    toc = bs4.BeautifulSoup(toc_html, "html.parser").div
     # add the toc to the soup
     soup.body.insert(0, toc)  # type: ignore
 
-    # now call the recursive function to add the items to the toc with proper indentation and links
-    _add_items_from_tree(tree, soup, toc_list)
-
-    # make each heading clickable by wrapping it in an anchor tag
-    for heading in soup.find_all(re.compile("h[0-9]{1}")):
+    # make each heading clickable by wrapping it in an anchor tag. this includes the toc heading.
+    for heading, title in zip(headings + [toc.h1], titles + [toc.h1.string]):  # type: ignore
         anchor = soup.new_tag("a", href=f"#{heading['id']}")
-        anchor.string = heading.get_text()
+        anchor.string = title
         heading.string = ""
         heading.append(anchor)
+    return True
 
-    return str(soup)
+
+def _toc_items_html(tree: dict) -> str:
+    """
+    Render the items of the table of contents from a tree, as html list items with proper nesting
+    and links.
+
+    Parameters
+    ----------
+    tree : dict
+        Tree to add items from. Keys are (heading name, heading id) tuples, where the heading name is
+        a string that will be displayed in the table of contents, and the heading id is the id of the
+        heading that the table of contents item links to. Values are dicts that contain the
+        children of the heading. If a heading has no children, then the value is empty.
+
+    Returns
+    -------
+    str
+        html for the list items, without the enclosing list.
+    """
+    parts = []
+    # walk the tree depth first without recursion. the stack holds an iterator over the items of
+    # each list that is still open, innermost last.
+    stack = [iter(tree.items())]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            # this list is done. unless it's the top level, close it and the item that contains it.
+            stack.pop()
+            if stack:
+                parts.append("</ul></li>")
+            continue
+        (text, link), children = item
+        parts.append(f'<li><a href="#{escape(link)}">{escape(text)}</a>')
+        # if the heading has children, then open a new list inside the list item, and add the
+        # children to it before moving on to this item's siblings
+        if len(children) > 0:
+            parts.append("<ul>")
+            stack.append(iter(children.items()))
+        else:
+            parts.append("</li>")
+    return "".join(parts)
 
 
 def _table_to_html(
-    obj: Union[pd.Series, pd.DataFrame], color_score: bool = False, percent: bool = False
+    obj: Union[pd.Series, pd.DataFrame],
+    color_score: bool = False,
+    percent: bool = False,
+    legacy: bool = False,
 ) -> str:
     """
     Convert a DataFrame to html. apply a background gradient to the whole table based on the
     score range.
 
-    TODO: Figure out how to make row label backgrounds not transparent.
-    https://pandas.pydata.org/pandas-docs/stable/user_guide/style.html
-    https://stackoverflow.com/questions/68140575/styling-the-background-color-of-pandas-index-cell
-    https://betterdatascience.com/style-pandas-dataframes/
+    The table is rendered directly from a template, with the background colors computed for the
+    whole table at once. This is much faster than a pandas Styler, which builds and renders a
+    context for every cell. The table is given the "fikl-table" class, which is styled in the index
+    template.
 
     Parameters
     ----------
@@ -176,6 +251,8 @@ def _table_to_html(
     percent : bool
         Whether to format the values as percentages. if False, then trailing zeros will be removed
         so that only significant digits are shown.
+    legacy : bool
+        Whether to render the table with a pandas Styler instead, as was done originally.
 
     Returns
     -------
@@ -192,43 +269,182 @@ def _table_to_html(
     else:
         table = obj
 
-    styler = table.style
+    # nothing to show, e.g. a metric without any factors
+    if table.empty:
+        return ""
+
+    if legacy:
+        return _styler_table_to_html(table, color_score=color_score, percent=percent)
+
+    # only numeric columns can take a numeric format or a color. anything else (e.g. bools or
+    # strings in the raw data) is just converted to a string.
+    numeric = np.array(
+        [is_numeric_dtype(dtype) and not is_bool_dtype(dtype) for dtype in table.dtypes], dtype=bool
+    )
+    fmt = "{0:.0%}" if percent else "{0:g}"
+    # text for every cell, one list per column
+    texts = [
+        [fmt.format(v) for v in table.iloc[:, j]]
+        if numeric[j]
+        else [str(v) for v in table.iloc[:, j]]
+        for j in range(table.shape[1])
+    ]
+
+    # css for every cell, one list per column. empty if the cell isn't styled.
+    styles = [[""] * table.shape[0] for _ in range(table.shape[1])]
+    if color_score and numeric.any():
+        values = table.iloc[:, numeric].to_numpy(dtype=np.float64)
+        for j, column_styles in zip(np.flatnonzero(numeric), _score_css(values).T):
+            styles[j] = list(column_styles)
+
+    rows = [
+        (label, [(texts[j][i], styles[j][i]) for j in range(table.shape[1])])
+        for i, label in enumerate(table.index)
+    ]
+    return fill_template(
+        "table",
+        index_name="" if table.index.name is None else table.index.name,
+        columns=list(table.columns),
+        rows=rows,
+    )
+
+
+@functools.cache
+def _score_cmap() -> Any:
+    """
+    Color map for score backgrounds in tables. Building it is not free, so only do it once. seaborn
+    (and through it, matplotlib) is imported here rather than at the top of the module, since it is
+    slow to import and only needed once there is a table to color.
+
+    Returns
+    -------
+    matplotlib.colors.Colormap
+        red to green color map, for scores from 0 to 1
+    """
+    import seaborn as sns
+
+    return sns.color_palette("RdYlGn", as_cmap=True)
+
+
+def _score_css(values: np.ndarray) -> np.ndarray:
+    """
+    Get the css that colors the background of cells by score, for a whole array of scores at once.
+    This matches the colors of a pandas Styler background_gradient with the score color map from 0
+    to 1, including switching to light text on dark backgrounds.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        scores, nominally between 0 and 1. NaN scores are not colored.
+
+    Returns
+    -------
+    np.ndarray
+        array of css strings, the same shape as values.
+    """
+    rgb = _score_cmap()(values)[..., :3]
+    # relative luminance of each background, the same way pandas decides on the text color
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    dark = linear @ np.array([0.2126, 0.7152, 0.0722]) < _TEXT_COLOR_THRESHOLD
+    rgb_bytes = np.round(rgb * 255).astype(np.uint8)
+    css = np.empty(values.shape, dtype=object)
+    for idx in np.ndindex(values.shape):
+        if np.isnan(values[idx]):
+            css[idx] = ""
+            continue
+        r, g, b = rgb_bytes[idx]
+        text_color = "#f1f1f1" if dark[idx] else "#000000"
+        css[idx] = f"background-color: #{r:02x}{g:02x}{b:02x}; color: {text_color};"
+    return css
+
+
+def _styler_table_to_html(table: pd.DataFrame, color_score: bool, percent: bool) -> str:
+    """
+    Convert a DataFrame to html with a pandas Styler. See _table_to_html().
+
+    TODO: Figure out how to make row label backgrounds not transparent.
+    https://pandas.pydata.org/pandas-docs/stable/user_guide/style.html
+    https://stackoverflow.com/questions/68140575/styling-the-background-color-of-pandas-index-cell
+    https://betterdatascience.com/style-pandas-dataframes/
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        DataFrame to convert to html
+    color_score : bool
+        Whether to apply a background gradient to the whole table based on the value.
+    percent : bool
+        Whether to format the values as percentages.
+
+    Returns
+    -------
+    str
+        html as a string.
+    """
+    # the styler module imports matplotlib.pyplot, which is slow, so only import it when the legacy
+    # path is actually used
+    from pandas.io.formats.style import Styler
+
+    # set everything that doesn't depend on the data up front. only emit ids for cells that
+    # actually get styled, instead of one for every cell. the uuid is left alone since several
+    # tables share the same document and their css must not collide. the styler extends its table
+    # styles in place, so give it its own copy.
+    styler = Styler(table, table_styles=list(_TABLE_STYLES), cell_ids=False)
 
     # apply a background gradient to the whole table based on the score range. it is possible to apply a background gradient to a subset of the columns, using `subset`
-    if color_score:
+    # there's nothing to color if every value is missing
+    if color_score and not table.isna().all(axis=None):
         styler = styler.background_gradient(
             axis="index",
             # cmap=sns.color_palette("YlGnBu", as_cmap=True),
             # cmap = sns.diverging_palette(10, 150, as_cmap=True),
             # cmap=sns.light_palette("seagreen", as_cmap=True),
-            cmap=sns.color_palette("RdYlGn", as_cmap=True),
+            cmap=_score_cmap(),
             vmin=0.0,
             vmax=1.0,
         )
 
+    # only numeric columns can take a numeric format. anything else (e.g. bools or strings in the
+    # raw data) is left to the default formatter rather than being run through a format that
+    # doesn't apply to it.
+    numeric_cols = table.select_dtypes(include="number").columns
     if percent:
         # scores are all floats between 0 and 1, so format them as percentages
-        # it is possible to apply a format to a subset of the columns, by passing a dict to format
-        styler = styler.format("{0:.0%}")
+        styler = styler.format("{0:.0%}", subset=numeric_cols)
     else:
         # raw data may be floats or ints. either way, we just want to remove trailing zeros so
         # that only significant digits are shown
-        styler = styler.format("{0:g}")
-
-    styler = styler.set_table_styles([{"selector": "th", "props": [("font-family", "Courier")]}])
-    styler = styler.set_properties(
-        **{
-            "text-align": "center",
-            "font-family": "Courier",
-            "font-size": "11px",
-        }
-    )
+        styler = styler.format("{0:g}", subset=numeric_cols)
+
     # make the index (city name) sticky so that it stays on the left side of the screen when scrolling
     styler = styler.set_sticky(axis="index")
 
     return styler.to_html()
 
 
+def _plain_table_to_html(table: pd.DataFrame) -> str:
+    """
+    Convert a DataFrame to html without going through a pandas Styler. This is much faster than
+    _table_to_html(), but only suitable for tables that don't need any per-cell styling. The table is
+    given the "fikl-table" class, which is styled in the index template.
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        DataFrame to convert to html
+
+    Returns
+    -------
+    str
+        html as a string.
+    """
+    # remove trailing zeros from floats so that only significant digits are shown, the same as
+    # _table_to_html() does
+    return table.to_html(
+        classes="fikl-table", border=0, index_names=False, float_format="{0:g}".format
+    )
+
+
 def _reorder_list(l: List, idxs: List[int]) -> List:
     """
     reorder a list based on a list of indices. the indices are into the original list.
@@ -248,12 +464,12 @@ def _reorder_list(l: List, idxs: List[int]) -> List:
     return [l[i] for i in idxs]
 
 
-def _metrics_weight_table_to_png(name: str, weights: pd.Series, assets_dir: str) -> str:
+def _metrics_weight_chart_svg(name: str, weights: pd.Series) -> str:
     """
-    use matplotlib to generate a bar chart for factor weights for each entry in
-    Decision.metrics_weights_tables.
-    save the chart as a png in the assets_dir. return the relative path to the png file within
-    the assets_dir.
+    generate a horizontal bar chart for factor weights for each entry in
+    Decision.metrics_weights_tables. return the chart as an svg string that can be inlined directly
+    into the html. the chart is just a labeled bar per factor, so the svg is written by hand rather
+    than going through a plotting library.
 
     Parameters
     ----------
@@ -261,72 +477,88 @@ def _metrics_weight_table_to_png(name: str, weights: pd.Series, assets_dir: str)
         name of the metric
     weights : pd.Series
         weights for a single metric. index is the factor names. values are the weights (0-1).
-    assets_dir : str
-        folder to stick html assets
 
     Returns
     -------
     str
-        relative path to the png file
+        the chart as an svg element
     """
-    # get the labels for the bar chart
-    labels = weights.index
-    # get the values for the bar chart as percentages
-    values = 100 * weights.values
-
-    # generate the horizontal chart
-    fig, ax = plt.subplots()
-    ax.set_title(f"Factor Weighting for Metric: {name}")
-    ax.barh(labels, values)
-    # disable x axis
-    ax.xaxis.set_visible(False)
-    # show the values of each bar as a right hand y axis label. each label should be outside of the
-    # chart area. format as a percentage.
-    right_yax = ax.twinx()
-    right_yax.set_yticklabels([f"{v:.0f}%" for v in values], ha="left")
-    # set ytick locations to be the same as the bar locations
-    right_yax.set_yticks(ax.get_yticks())
-    # set the limits of the right y axis to be the same as the left y axis
-    right_yax.set_ylim(ax.get_ylim())
-
-    # tight fit to make sure the labels aren't cut off
-    fig.tight_layout()
-
-    # save to png
-    png_abs_path = os.path.join(assets_dir, f"{name}.png")
-    fig.savefig(png_abs_path)
-
-    # convert to html
-    # want it to be relative to the html file, so use a relative path
-    png_rel_path = os.path.relpath(png_abs_path, os.path.dirname(assets_dir))
-
-    return png_rel_path
-
-
-def report(decision: Decision, path: Optional[str] = None) -> Optional[str]:
+    # a metric whose factors are all weighted zero has NaN weights after normalization
+    values = np.nan_to_num(weights.to_numpy(dtype=np.float64))
+    # scale the bars so that the bars from the most negative to the most positive weight span the
+    # whole bar area. negative bars go to the left of a zero line, positive bars to the right. with
+    # no negative weights, the zero line is at the left edge and the largest weight fills the area.
+    neg_span = max(-values.min(), 0.0) if len(values) > 0 else 0.0
+    pos_span = max(values.max(), 0.0) if len(values) > 0 else 0.0
+    span = neg_span + pos_span if neg_span + pos_span > 0 else 1.0
+    labels = [str(label) for label in weights.index]
+
+    # the text isn't measured, so size the label column from a rough per character width
+    label_width = _CHART_CHAR_WIDTH * max([len(label) for label in labels], default=0) + 10
+    title = f"Factor Weighting for Metric: {name}"
+    # make sure the title fits, even if the bars don't need that much room
+    width = max(
+        label_width + _CHART_BAR_WIDTH + _CHART_VALUE_WIDTH, _CHART_CHAR_WIDTH * len(title) + 10
+    )
+    height = _CHART_TITLE_HEIGHT + _CHART_ROW_HEIGHT * len(labels)
+
+    zero_x = label_width + neg_span / span * _CHART_BAR_WIDTH
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="12" role="img" '
+        f'aria-label="{escape(title)}">',
+        # the accessible name of the chart, in place of the alt text of an image
+        f"<title>{escape(title)}</title>",
+        f'<text x="{width / 2}" y="{_CHART_TITLE_HEIGHT * 0.6}" text-anchor="middle" '
+        f'font-size="14">{escape(title)}</text>',
+    ]
+    for i, (label, value) in enumerate(zip(labels, values)):
+        top = _CHART_TITLE_HEIGHT + i * _CHART_ROW_HEIGHT
+        # vertically center the text on the bar
+        text_y = top + _CHART_ROW_HEIGHT * 0.7
+        # factor name to the left of the bar
+        parts.append(
+            f'<text x="{label_width - 5}" y="{text_y}" text-anchor="end">{escape(label)}</text>'
+        )
+        bar_width = abs(value) / span * _CHART_BAR_WIDTH
+        bar_x = zero_x - bar_width if value < 0 else zero_x
+        parts.append(
+            f'<rect x="{bar_x}" y="{top + 2}" width="{bar_width}" '
+            f'height="{_CHART_ROW_HEIGHT - 4}" fill="#1f77b4"/>'
+        )
+        # weight as a percentage to the right of the bar area
+        parts.append(
+            f'<text x="{label_width + _CHART_BAR_WIDTH + 5}" y="{text_y}">{value:.0%}</text>'
+        )
+    # mark zero when some bars go left of it
+    if neg_span > 0:
+        parts.append(
+            f'<line x1="{zero_x}" y1="{_CHART_TITLE_HEIGHT}" x2="{zero_x}" y2="{height}" '
+            'stroke="black"/>'
+        )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _fill_index_template(decision: Decision) -> str:
     """
-    Generate an html report for a decision.
+    Render every table, chart, and doc for a decision and fill them into the index template.
+
+    This is kept separate from report() so that the intermediate html blobs go out of scope as soon
+    as the template has been filled, rather than staying alive while the full document is parsed
+    and post-processed.
 
     Parameters
     ----------
     decision : Decision
         Decision to generate the report for
-    path : str, optional
-        Path to write the html to. If None, then the html will be returned as a string.
 
     Returns
     -------
-    Optional[str]
-        If path is None, then the html as a string. Otherwise, None.
+    str
+        the filled template, before the table of contents is added
     """
-    # folder to stick html assets should have the same name as the html file, but with _assets
-    # if path is None, then just use a temp folder
-    if path is None:
-        assets_dir = tempfile.mkdtemp()
-    else:
-        assets_dir = os.path.join(os.path.dirname(path), f"{os.path.basename(path)}_assets")
-        os.makedirs(assets_dir, exist_ok=True)
-
     # sort the final table by the final score
     final_table = _table_to_html(decision.final_table(sort=True), color_score=True, percent=True)
 
@@ -341,20 +573,17 @@ def report(decision: Decision, path: Optional[str] = None) -> Optional[str]:
         _table_to_html(table, color_score=True, percent=True) for table in decision.metrics_tables()
     ]
     metrics_tables = _reorder_list(metrics_tables, metric_order)
-    # list of weight tables for each metric
-    metrics_weight_tables = [
-        _metrics_weight_table_to_png(metric, weights, assets_dir)
+    # list of weight charts for each metric
+    metrics_weight_charts = [
+        _metrics_weight_chart_svg(metric, weights)
         for metric, weights in zip(decision.metrics(), decision.metrics_weight_tables())
     ]
-    metrics_weight_tables = _reorder_list(metrics_weight_tables, metric_order)
+    metrics_weight_charts = _reorder_list(metrics_weight_charts, metric_order)
 
     measures_table = _table_to_html(decision.measures_table(), color_score=True, percent=True)
 
-    # FIXME: remove duplicate columns from sources table in Decision, instead of hacking it here
-    sources_table = decision.sources_table()
-    # remove duplicate columns
-    sources_table = sources_table.loc[:, ~sources_table.columns.duplicated()]
-    sources_table = _table_to_html(sources_table, color_score=False, percent=False)
+    # the sources table has no per-cell styling, so skip the Styler
+    sources_table = _plain_table_to_html(decision.sources_table())
 
     sources_per_measure = [measure.source for measure in decision.config.measures]
 
@@ -363,13 +592,13 @@ def report(decision: Decision, path: Optional[str] = None) -> Optional[str]:
     scorer_docs = [html_from_doc(doc) for doc in decision.scorer_docs()]
 
     # dump the html blobs into a template
-    html = fill_template(
+    return fill_template(
         "index",
         answer=decision.answer(),
         final_table=final_table,
         metrics=metrics,
         metrics_tables=metrics_tables,
-        metrics_weight_tables=metrics_weight_tables,
+        metrics_weight_charts=metrics_weight_charts,
         ignored_metrics=decision.ignored_metrics(),
         measures_table=measures_table,
         sources_table=sources_table,
@@ -378,8 +607,31 @@ def report(decision: Decision, path: Optional[str] = None) -> Optional[str]:
         measure_docs=measure_docs,
         scorer_docs=scorer_docs,
     )
-    html = add_toc(html)
-    html = bs4.BeautifulSoup(html, "html.parser").prettify()
+
+
+def report(decision: Decision, path: Optional[str] = None, pretty: bool = False) -> Optional[str]:
+    """
+    Generate an html report for a decision.
+
+    Parameters
+    ----------
+    decision : Decision
+        Decision to generate the report for
+    path : str, optional
+        Path to write the html to. If None, then the html will be returned as a string.
+    pretty : bool
+        Whether to prettify the html. Browsers don't care about indentation, so this is only useful
+        for reading the html by hand, and it costs a full walk of the document.
+
+    Returns
+    -------
+    Optional[str]
+        If path is None, then the html as a string. Otherwise, None.
+    """
+    # parse the document once, add the table of contents in place, then serialize it
+    soup = bs4.BeautifulSoup(_fill_index_template(decision), "lxml")
+    _add_toc_to_soup(soup)
+    html = soup.prettify() if pretty else str(soup)
 
     if path is None:
         return html
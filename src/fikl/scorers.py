@@ -23,6 +23,7 @@ TODO:
 from fikl.util import ensure_type
 from fikl.proto import config_pb2
 
+import functools
 import logging
 from collections import namedtuple
 from typing import Optional, Any, Dict, List, Callable
@@ -33,6 +34,26 @@ import numpy as np
 from google.protobuf.json_format import MessageToDict
 
 
+def _scored_like(col: pd.Series, scores: np.ndarray) -> pd.Series:
+    """
+    Wrap scores computed on a column's underlying array back into a Series, with the column's index
+    and name. The scores are not copied.
+
+    Parameters
+    ----------
+    col : pd.Series
+        the column that was scored
+    scores : np.ndarray
+        the scores, in the same order as the column
+
+    Returns
+    -------
+    pd.Series
+        the scored column
+    """
+    return pd.Series(scores, index=col.index, name=col.name, copy=False)
+
+
 class Star:
     """
     Scorer that accepts input as ints on a fixed scale, such as the 5 start scale, where
@@ -80,20 +101,27 @@ class Star:
         pd.Series
             the scored column, with values between 0 and 1
         """
-        ensure_type(col, pd.Series)
-        # make sure all values are between the min and max
-        if not (col >= self.min).all():
+        # the column type is a programming error rather than a config error, so only check it when
+        # not running optimized (python -O)
+        if __debug__:
+            ensure_type(col, pd.Series)
+        arr = col.to_numpy()
+        # make sure all values are ints, of any width. this is checked first, since it's free and
+        # the range checks below make no sense for anything else.
+        if arr.dtype.kind not in "iu":
+            raise TypeError(f"all values in column must be ints but col dtype is {col.dtype}")
+        # make sure all values are between the min and max. only the extremes need to be checked.
+        if len(arr) > 0 and arr.min() < self.min:
             raise ValueError(f"all values in column must be >= {self.min}, but got\n{col}")
-        if not (col <= self.max).all():
+        if len(arr) > 0 and arr.max() > self.max:
             raise ValueError(f"all values in column must be <= {self.max}, but got\n{col}")
-        # make sure all values are ints
-        if not col.dtype == int:
-            raise TypeError(f"all values in column must be ints but col dtype is {col.dtype}")
-        # compute the return
-        ret = (col - self.min) / self.range
-        # make sure all values lie between 0 and 1. use assertion since this should never happen.
-        assert (ret >= 0).all() and (ret <= 1).all()
-        return ret
+        # compute the return on the underlying array, rather than through pandas. the subtraction
+        # makes the one float array, and the division is done in place on it. dividing by the range,
+        # rather than multiplying by its inverse, keeps the ends of the scale exactly at 0 and 1.
+        scores = np.subtract(arr, self.min, dtype=np.float64)
+        scores /= self.range
+        # the range checks above guarantee the scores lie between 0 and 1
+        return _scored_like(col, scores)
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer."""
@@ -147,6 +175,15 @@ class Bucket:
         def __repr__(self) -> str:
             return f"Bucket.Pail(min={self.min}, max={self.max}, val={self.val})"
 
+        @classmethod
+        def _validated(cls, min: float, max: float, val: float) -> "Bucket.Pail":
+            """Create a pail from floats that have already been validated, skipping the checks."""
+            pail = cls.__new__(cls)
+            pail.min = min
+            pail.max = max
+            pail.val = val
+            return pail
+
     def __init__(self, buckets: List[Dict[str, float]]):
         """
         Parameters
@@ -157,30 +194,65 @@ class Bucket:
             between 0 and 1.
         """
         ensure_type(buckets, list)
-        # store pails in order of increasing min. Allow the bucket ctor to do the validation.
-        self.pails: List[Bucket.Pail] = sorted(
-            [Bucket.Pail(**entry) for entry in buckets], key=lambda b: b.min
+        # check the shape of the input before reading it into arrays, so that bad input gets a clear
+        # error rather than failing somewhere inside numpy
+        if len(buckets) == 0:
+            raise ValueError("at least one bucket is required")
+        for entry in buckets:
+            if set(entry) != {"min", "max", "val"}:
+                raise TypeError(
+                    f"bucket {entry} must have exactly the keys 'min', 'max', and 'val'"
+                )
+        # if inputs are not floats, they are cast to floats, but log a warning
+        for entry in buckets:
+            for key in ("min", "max", "val"):
+                if not isinstance(entry[key], float):
+                    logging.warning(f"{key} {entry[key]} is not a float, casting to float")
+        # read the bounds and values of every bucket into arrays at once, and validate them all
+        # together rather than one pail at a time
+        mins, maxs, vals = (
+            np.array(
+                [(entry["min"], entry["max"], entry["val"]) for entry in buckets], dtype=np.float64
+            )
+            .reshape(-1, 3)
+            .T
         )
+        # written so that NaN fails the checks. report the first bucket that fails.
+        bad = ~(mins < maxs)
+        if bad.any():
+            i = bad.argmax()
+            raise ValueError(f"min {mins[i]} must be < max {maxs[i]}")
+        bad = ~((vals >= 0) & (vals <= 1))
+        if bad.any():
+            raise ValueError(f"val {vals[bad.argmax()]} must be between 0 and 1")
+        # store pails in order of increasing min
+        order = np.argsort(mins, kind="stable")
+        mins, maxs, vals = mins[order], maxs[order], vals[order]
+        self.pails: List[Bucket.Pail] = [
+            Bucket.Pail._validated(*bounds)
+            for bounds in zip(mins.tolist(), maxs.tolist(), vals.tolist())
+        ]
         # ensure that the pails are contiguous
-        for i, pail in enumerate(self.pails[:-1]):
-            if pail.max != self.pails[i + 1].min:
-                raise ValueError(
-                    "pails must be contiguous, but got pails {} and {}".format(
-                        pail, self.pails[i + 1]
-                    )
-                )
-        # ensure the type of the min and max are the same for all pails
-        if not all([type(pail.min) is type(self.pails[0].min) for pail in self.pails]):
-            raise TypeError(
-                "all pails must have the same type for min and max, but got {}".format(
-                    [type(pail.min) for pail in self.pails]
+        bad = maxs[:-1] != mins[1:]
+        if bad.any():
+            i = bad.argmax()
+            raise ValueError(
+                "pails must be contiguous, but got pails {} and {}".format(
+                    self.pails[i], self.pails[i + 1]
                 )
             )
+        # since the pails are sorted and contiguous, they are fully described by their edges (every
+        # min, plus the last max) and their values. keep these as arrays so that scoring a column
+        # is a single search over the edges. every bound is a float64, so there's no need to check
+        # that they all have the same type.
+        self._edges = np.append(mins, maxs[-1])
+        self._vals = vals
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Bucket):
             return False
-        return self.pails == other.pails
+        # the pails are sorted and contiguous, so the edges and values describe them completely
+        return np.array_equal(self._edges, other._edges) and np.array_equal(self._vals, other._vals)
 
     def __call__(self, col: pd.Series) -> pd.Series:
         """
@@ -194,25 +266,26 @@ class Bucket:
         pd.Series
             the scored column, with values between 0 and 1
         """
-        # make sure all values are between the min and max
-        if not (col >= self.pails[0].min).all():
-            raise ValueError(f"all values in column must be >= {self.pails[0].min}, but got\n{col}")
-        if not (col < self.pails[-1].max).all():
+        arr = col.to_numpy()
+        # make sure all values are floats, like the bucket min and max. any width is fine, since the
+        # edges they're compared against are float64. this is checked first, since it's free and
+        # the range checks below make no sense for anything else.
+        if arr.dtype.kind != "f":
             raise ValueError(
-                f"all values in column must be <= {self.pails[-1].max}, but got\n{col}"
+                f"all values in column must be same type as bucket min {self.pails[0].min} but col dtype is {col.dtype}"
             )
-        # make sure all values are same type as bucket min and max
-        if not col.dtype == type(self.pails[0].min):
+        # make sure all values are between the min and max. written so that NaN fails the check.
+        if len(arr) > 0 and not arr.min() >= self._edges[0]:
+            raise ValueError(f"all values in column must be >= {self.pails[0].min}, but got\n{col}")
+        if len(arr) > 0 and not arr.max() < self._edges[-1]:
             raise ValueError(
-                f"all values in column must be same type as bucket min {self.pails[0].min} but col dtype is {col.dtype}"
+                f"all values in column must be <= {self.pails[-1].max}, but got\n{col}"
             )
-        # compute the return and check for values which are not in any bucket
-        ret = pd.Series(np.zeros(len(col)), index=col.index)  # type: ignore
-        for bucket in self.pails:
-            ret[(col >= bucket.min) & (col < bucket.max)] = bucket.val
-        # make sure all values lie between 0 and 1
-        assert (ret >= 0).all() and (ret <= 1).all()
-        return ret
+        # find the pail for each value. a value equal to an edge belongs to the pail that starts
+        # there, hence side="right". every value is in range, so every index is valid.
+        idxs = np.searchsorted(self._edges, arr, side="right") - 1
+        # the pail values are checked to lie between 0 and 1 in the constructor
+        return _scored_like(col, self._vals[idxs])
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer."""
@@ -261,20 +334,29 @@ class Relative:
         pd.Series
             the scored column, with values between 0 and 1
         """
+        # see Star.__call__ for why this is only checked when not running optimized
+        if __debug__:
+            ensure_type(col, pd.Series)
         # make sure all values are DTYPE. if not, try to cast them to DTYPE and log a warning.
-        ensure_type(col, pd.Series)
         if not col.dtype == self.DTYPE:
             logging.warning(
                 f"column dtype is {col.dtype} but scorer {self} requires dtype {self.DTYPE}, casting to {self.DTYPE}"
             )
             col = col.astype(self.DTYPE)
-        # compute the return
-        ret = (col - col.min()) / (col.max() - col.min())
+        # compute the return on the underlying array, rather than through pandas. the subtraction
+        # makes the one float array, and everything after it is done in place.
+        arr = col.to_numpy()
+        lo = arr.min()
+        span = arr.max() - lo
+        # the scores lie between 0 and 1 as long as the values are spread out. if they're all the
+        # same, or any is NaN, there's nothing to scale by. written so that NaN fails the check.
+        if not span > 0:
+            raise ValueError(f"values in column must differ and not be NaN, but got\n{col}")
+        scores = np.subtract(arr, lo, dtype=np.float64)
+        scores /= span
         if self.invert:
-            ret = 1.0 - ret
-        # make sure all values lie between 0 and 1
-        assert (ret >= 0).all() and (ret <= 1).all()
-        return ret
+            np.subtract(1.0, scores, out=scores)
+        return _scored_like(col, scores)
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer."""
@@ -303,23 +385,32 @@ class Interpolate:
             value. "out" must be between 0 and 1. "in" corresponds to user input, and "out" is the
             score that will be assigned to that input.
         """
-        # let's call x the input and y the output
-        self.knots = pd.DataFrame(knots)
+        # let's call x the input and y the output. keep them as arrays, so that interpolating is a
+        # single numpy call. the knots as given are kept for the docs.
+        self._knot_list = list(knots)
+        self._xp = np.fromiter((knot["in"] for knot in knots), dtype=np.float64, count=len(knots))
+        self._fp = np.fromiter((knot["out"] for knot in knots), dtype=np.float64, count=len(knots))
         # ensure that the knots are given in increasing "in" order
-        if not (self.knots["in"].diff()[1:] >= 0).all():  # first diff is NaN
+        if not (np.diff(self._xp) >= 0).all():
             raise ValueError("knots must be given in increasing order of input")
         # ensure that outputs are all between 0 and 1
-        if not (self.knots["out"] >= 0).all() or not (self.knots["out"] <= 1).all():
+        if not (self._fp >= 0).all() or not (self._fp <= 1).all():
             raise ValueError("all outputs must be between 0 and 1")
-        # create a function to interpolate between the knots
-        self.spline = lambda x: np.interp(x, self.knots["in"], self.knots["out"])
+        # the inputs are sorted, so the first and last are the bounds
+        self._in_min = self._xp[0]
+        self._in_max = self._xp[-1]
+
+    @property
+    def knots(self) -> pd.DataFrame:
+        """The knots as a DataFrame with "in" and "out" columns."""
+        return pd.DataFrame(self._knot_list)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Interpolate):
             return False
-        return self.knots.equals(other.knots)
+        return np.array_equal(self._xp, other._xp) and np.array_equal(self._fp, other._fp)
 
-    def __call__(self, col: pd.Series) -> np.ndarray:
+    def __call__(self, col: pd.Series) -> pd.Series:
         """
         Parameters
         ----------
@@ -328,7 +419,7 @@ class Interpolate:
 
         Returns
         -------
-        np.ndarray
+        pd.Series
             scored column, with values between 0 and 1
         """
         # make sure all values are DTYPE. if not, try to cast them to DTYPE and log a warning.
@@ -337,17 +428,32 @@ class Interpolate:
                 f"column dtype is {col.dtype} but scorer {self} requires dtype {self.DTYPE}, casting to {self.DTYPE}"
             )
             col = col.astype(self.DTYPE)
-        # we don't want to extrapolate, so make sure all values are between the min and max
-        if not (col >= self.knots["in"].min()).all() or not (col <= self.knots["in"].max()).all():
+        arr = col.to_numpy(dtype=np.float64)
+        # we don't want to extrapolate, so make sure all values are between the min and max. written
+        # so that NaN fails the check.
+        if len(arr) > 0 and not (arr.min() >= self._in_min and arr.max() <= self._in_max):
             raise ValueError(
-                f"all values in column must be between {self.knots['in'].min()} and {self.knots['in'].max()}, but got\n{col}"
+                f"all values in column must be between {self._in_min} and {self._in_max}, but got\n{col}"
             )
-        # compute the return
-        ret = self.spline(col)
-        # make sure all values lie between 0 and 1
-        if not (ret >= 0).all() or not (ret <= 1).all():
-            raise ValueError(f"all values in column must be between 0 and 1, but got\n{ret}")
-        return ret
+        # compute the return. the knot outputs are checked to be between 0 and 1 in the constructor,
+        # and interpolating between them without extrapolating can't leave that range.
+        return _scored_like(col, self._interpolate(arr))
+
+    def _interpolate(self, arr: np.ndarray) -> np.ndarray:
+        """
+        Interpolate between the knots. The values have already been checked to lie within them.
+
+        Parameters
+        ----------
+        arr : np.ndarray
+            the values to score, as floats
+
+        Returns
+        -------
+        np.ndarray
+            the scores
+        """
+        return np.interp(arr, self._xp, self._fp)
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer. Print out the knots in a Markdown table,
@@ -364,12 +470,7 @@ class Interpolate:
             """
             )
             + "\n{}".format(
-                "\n".join(
-                    [
-                        f"| {knot['in']} | {knot['out'] * 100} |"
-                        for knot in self.knots.to_dict(orient="records")
-                    ]
-                )
+                "\n".join([f"| {knot['in']} | {knot['out'] * 100} |" for knot in self._knot_list])
             )
         )
 
@@ -392,12 +493,38 @@ class Range(Interpolate):
             super().__init__([{"in": best, "out": 1}, {"in": worst, "out": 0}])
         else:
             raise ValueError("worst and best must be different")
+        # with only two knots, the score is a straight line from one to the other, so there's no
+        # need for np.interp to search for the knots around each value.
+        self._span = self._in_max - self._in_min
+        self._invert = worst > best
+
+    def _interpolate(self, arr: np.ndarray) -> np.ndarray:
+        """
+        Map the values onto the line between the two knots. The values have already been checked to
+        lie within them.
+
+        Parameters
+        ----------
+        arr : np.ndarray
+            the values to score, as floats
+
+        Returns
+        -------
+        np.ndarray
+            the scores
+        """
+        scores = np.subtract(arr, self._in_min)
+        scores /= self._span
+        # the lower input is the best value, so it gets the highest score
+        if self._invert:
+            np.subtract(1.0, scores, out=scores)
+        return scores
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer. Print out the knots in text format."""
         return f"""
-            Linearly interpolated with {self.knots["in"][0]} mapped to {self.knots["out"][0] * 100}%
-            and {self.knots["in"][1]} mapped to {self.knots["out"][1] * 100}%.
+            Linearly interpolated with {self._knot_list[0]["in"]} mapped to {self._knot_list[0]["out"] * 100}%
+            and {self._knot_list[1]["in"]} mapped to {self._knot_list[1]["out"] * 100}%.
             """
 
 
@@ -439,11 +566,13 @@ class Bool:
             raise TypeError(
                 f"column dtype is {col.dtype} but scorer {self} requires dtype {self.DTYPE}"
             )
-        # compute the return
+        # compute the return. for the inverted case, subtracting from 1 casts and inverts in one go,
+        # without an inverted bool column in between.
+        arr = col.to_numpy()
         if self.good:
-            return col.astype(float)
+            return _scored_like(col, arr.astype(np.float64))
         else:
-            return (~col).astype(float)
+            return _scored_like(col, np.subtract(1.0, arr, dtype=np.float64))
 
     def doc(self) -> str:
         """Publish Markdown documentation for this scorer."""
@@ -480,6 +609,10 @@ scorer : Callable
 def get_scorer_info(measure: config_pb2.Measure) -> ScorerInfo:
     """Given a measure, return the scorer that it specifies.
 
+    Scorers are looked up by the measure's serialized bytes, so that the same measure (e.g. when a
+    config is loaded again) doesn't go through MessageToDict and the scorer constructor again.
+    Scorers are not modified by scoring, so it is safe to share them.
+
     Parameters
     ----------
     measure : config_pb2.Measure
@@ -488,6 +621,23 @@ def get_scorer_info(measure: config_pb2.Measure) -> ScorerInfo:
     -------
     ScorerInfo
     """
+    return _get_scorer_info_cached(measure.SerializeToString(deterministic=True))
+
+
+@functools.lru_cache(maxsize=256)
+def _get_scorer_info_cached(serialized: bytes) -> ScorerInfo:
+    """Same as get_scorer_info(), but takes the serialized measure, so that it can be cached.
+
+    Parameters
+    ----------
+    serialized : bytes
+        the measure, serialized to bytes
+
+    Returns
+    -------
+    ScorerInfo
+    """
+    measure = config_pb2.Measure.FromString(serialized)
     which = measure.scoring.WhichOneof("config")
     if which is None:
         raise ValueError("Measure {} does not specify a scorer".format(measure))
@@ -512,3 +662,29 @@ def get_scorer_info_from_config(config: config_pb2.Config) -> List[ScorerInfo]:
     List[ScorerInfo]
     """
     return [get_scorer_info(measure) for measure in config.measures]
+
+
+def score_all(data: pd.DataFrame, scorer_info: List[ScorerInfo]) -> pd.DataFrame:
+    """Score every measure at once. Each measure's source column is scored by its scorer, and the
+    scores are written straight into a single preallocated array, which is wrapped in a DataFrame
+    once at the end rather than inserting one column at a time.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        the source data. The index is the choice name, the columns are the sources.
+    scorer_info : List[ScorerInfo]
+        the measures to score
+
+    Returns
+    -------
+    pd.DataFrame
+        the scores, between 0 and 1. The index is the choice name, the columns are the measures, in
+        the order given.
+    """
+    # column-major, so that each measure's scores are contiguous, which is also how the DataFrame
+    # stores them. this way the DataFrame can use the array as is.
+    scores = np.empty((len(data), len(scorer_info)), dtype=np.float64, order="F")
+    for i, entry in enumerate(scorer_info):
+        scores[:, i] = entry.scorer(data[entry.source]).to_numpy()
+    return pd.DataFrame(scores, index=data.index, columns=[entry.measure for entry in scorer_info])
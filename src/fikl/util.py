@@ -1,15 +1,14 @@
 """
 Common utilities
 """
-from collections import OrderedDict
+import functools
 import logging
 import os
-from typing import Any, Type
+from typing import Any, Optional, Type, TYPE_CHECKING
 import yaml
-import json
 
-import jinja2
-import numpy as np
+if TYPE_CHECKING:
+    import jinja2
 
 
 def ensure_type(obj: Any, t: Type, inherit: bool = False) -> None:
@@ -33,6 +32,98 @@ def ensure_type(obj: Any, t: Type, inherit: bool = False) -> None:
             raise TypeError("object {} is not of type {}".format(obj, t))
 
 
+# templates live in the templates directory next to this file
+_TEMPLATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "templates"))
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _get_bytecode_cache() -> "Optional[jinja2.BytecodeCache]":
+    """
+    Create a cache that stores compiled templates on disk, so that each new process doesn't have to
+    recompile them. With no directory given, jinja uses a private per-user folder in the system temp
+    dir. The cache is only a speedup, so if that folder can't be used, or reading or writing it
+    fails later, templates are compiled in memory as if there were no cache.
+
+    Returns
+    -------
+    Optional[jinja2.BytecodeCache]
+        the cache, or None if there is no usable cache directory
+    """
+    import jinja2
+
+    class _BestEffortBytecodeCache(jinja2.FileSystemBytecodeCache):
+        def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+            try:
+                super().load_bytecode(bucket)
+            except OSError as e:
+                _LOGGER.debug("Could not read template cache: %s", e)
+
+        def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+            try:
+                super().dump_bytecode(bucket)
+            except OSError as e:
+                _LOGGER.debug("Could not write template cache: %s", e)
+
+    # jinja raises RuntimeError if the per-user folder exists but isn't safe to use, e.g. if it is
+    # owned by another user
+    try:
+        return _BestEffortBytecodeCache()
+    except (RuntimeError, OSError) as e:
+        _LOGGER.debug("Not caching compiled templates on disk: %s", e)
+        return None
+
+
+@functools.cache
+def _get_jinja_env() -> "jinja2.Environment":
+    """
+    Create the jinja environment. A single environment is shared by every call to fill_template, so
+    that each template is only loaded and compiled once per process. jinja2 is imported here rather
+    than at the top of the module, so that everything else that imports this module (e.g. the
+    scorers, for ensure_type) doesn't pay for it.
+
+    Returns
+    -------
+    jinja2.Environment
+        the shared environment
+    """
+    import jinja2
+
+    # cache_size=-1 means the template cache is unbounded. the templates ship with the package and
+    # don't change at runtime, so don't stat them on every use.
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(_TEMPLATE_DIR),
+        cache_size=-1,
+        auto_reload=False,
+        bytecode_cache=_get_bytecode_cache(),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _get_template(template_name: str) -> "jinja2.Template":
+    """
+    Look up a template by name. The lookup is cached, so that templates which are filled many times
+    (e.g. one per table) skip jinja's loader and cache checks after the first time.
+
+    Parameters
+    ----------
+    template_name : str
+        Name of the template, without the file extension.
+
+    Returns
+    -------
+    jinja2.Template
+        the compiled template
+    """
+    _LOGGER.debug("Loading template: %s from %s", template_name, _TEMPLATE_DIR)
+    # display the list of templates that jinja sees. this walks the templates directory, so only
+    # do it when it will actually be logged.
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Available templates: %s", _get_jinja_env().list_templates())
+    return _get_jinja_env().get_template(f"{template_name}.html.j2")
+
+
 def fill_template(template_name, **kwargs):
     """
     Generate HTML content from a Jinja2 template. Relies on the templates directory being in the
@@ -44,21 +135,11 @@ def fill_template(template_name, **kwargs):
         Name of the template to use. This should be the name of a file in the
         templates directory. It should not include the file extension.
     """
-    logger = logging.getLogger(__name__)
-    logger.debug("Generating HTML from template: %s", template_name)
-    template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "templates"))
-    logger.debug("Template directory: %s", template_dir)
+    _LOGGER.debug("Generating HTML from template: %s", template_name)
+    return _get_template(template_name).render(**kwargs)
 
-    # setup jinja
-    env = jinja2.Environment(loader=jinja2.FileSystemLoader(template_dir))
 
-    # display the list of templates that jinja sees
-    logger.debug(f"Available templates: {env.list_templates()}")
-    template = env.get_template(f"{template_name}.html.j2")
-    return template.render(**kwargs)
-
-
-def build_ordered_depth_first_tree(items: list[Any], levels: list[int]) -> OrderedDict:
+def build_ordered_depth_first_tree(items: list[Any], levels: list[int]) -> dict:
     """
     An bulleted outline (like in writing) is a tree. This function builds a tree from a list of
     items and their heading levels. The top level is 0. The items must be in order. The levels
@@ -75,6 +156,7 @@ def build_ordered_depth_first_tree(items: list[Any], levels: list[int]) -> Order
     -------
     dict
         A tree where each node is a dict. The keys of the dict are the items. The values of the dict
+        are the children of each item. dicts keep insertion order, so the items are in order.
 
     """
     # must have positive levels
@@ -84,63 +166,59 @@ def build_ordered_depth_first_tree(items: list[Any], levels: list[int]) -> Order
     if len(items) != len(levels):
         raise ValueError(f"len(items) != len(levels): {len(items)} != {len(levels)}")
     # when the level increases, it must only increase by 1 (no skipping levels)
-    if max(np.diff(levels)) > 1:
+    if any(level - prev_level > 1 for prev_level, level in zip(levels, levels[1:])):
         raise ValueError("levels must increase by 1. No skipping levels.")
     # first level must be 0
     if levels[0] != 0:
         raise ValueError(f"levels[0] != 0: have {levels[0]}")
 
-    # create the tree by first finding parents
-    # top level items have their own index set
-    parent_idxs = [None for _ in range(len(items))]
-    for i in range(len(parent_idxs)):
-        if levels[i] == 0:
-            parent_idxs[i] = i
-            continue
-        assert i > 0
-        if levels[i] > levels[i - 1]:
-            parent_idxs[i] = i - 1
-            continue
-        if levels[i] == levels[i - 1]:
-            parent_idxs[i] = parent_idxs[i - 1]
-            continue
-        if levels[i] < levels[i - 1]:
-            # start off with the parent of the previous item
-            parent_idxs[i] = parent_idxs[i - 1]
-            # now figure out how far up the tree we have to go
-            diff = levels[i - 1] - levels[i]
-            # go up the tree
-            for _ in range(diff):
-                parent_idxs[i] = parent_idxs[parent_idxs[i]]
-    # assert every parent idx is set
-    assert all([x is not None for x in parent_idxs])
-
-    # create the tree
-    tree = OrderedDict()
-    # contains pointers to the nodes in the tree that have been added
-    nodes = [None for _ in range(len(items))]
-    for i in range(len(items)):
-        parent_idx = parent_idxs[i]
-        item = items[i]
-        if parent_idx == i:
-            # this is a top level item
-            tree[item] = OrderedDict()
-            nodes[i] = tree[item]
-            continue
-        # this is not a top level item
-        # get the parent node
-        parent_node = nodes[parent_idx]
-        # add the item to the parent node
-        parent_node[item] = OrderedDict()
-        # set the node
-        nodes[i] = parent_node[item]
+    # create the tree in a single pass. stack[level] is the node that the next item at that level
+    # gets added to. the levels are validated above, so every item's level is at most one deeper
+    # than the previous item's, and its parent is always on the stack.
+    tree: dict = {}
+    stack = [tree]
+    for item, level in zip(items, levels):
+        # coming back up the tree, so forget the nodes that are deeper than this item
+        del stack[level + 1 :]
+        node: dict = {}
+        stack[level][item] = node
+        # this item's children will be added to its node
+        stack.append(node)
 
     return tree
 
 
+# parse yaml with libyaml when pyyaml was built with it, which is much faster than the pure python
+# loader. both are safe loaders, and they load the same documents.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _expand_aliases(data: Any) -> Any:
+    """
+    Copy loaded YAML data so that nothing in it is shared. YAML aliases load as references to the
+    same object as their anchor, so this turns each alias into its own copy. Unlike copy.deepcopy,
+    which would keep the sharing, every dict and list is copied wherever it appears.
+
+    Parameters
+    ----------
+    data : Any
+        The loaded YAML data
+
+    Returns
+    -------
+    Any
+        The same data, with no shared dicts or lists
+    """
+    if isinstance(data, dict):
+        return {key: _expand_aliases(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_expand_aliases(value) for value in data]
+    return data
+
+
 def load_yaml(stream) -> dict:
     """
-    Load YAML from a stream, fully expanding aliases. This is a hack.
+    Load YAML from a stream, fully expanding aliases.
 
     Parameters
     ----------
@@ -152,8 +230,7 @@ def load_yaml(stream) -> dict:
     dict
         The loaded YAML data
     """
-    data = yaml.load(stream, Loader=yaml.FullLoader)
-    return json.loads(json.dumps(data))
+    return _expand_aliases(yaml.load(stream, Loader=_YAML_LOADER))
 
 
 def merge_dicts(*dicts) -> dict:
@@ -3,10 +3,7 @@ Unit tests for fikl.config module, located in src/fikl/config.py
 """
 import unittest
 import os
-import tempfile
 import logging
-import json
-import yaml
 
 import fikl.config
 from fikl.proto import config_pb2
@@ -29,12 +26,12 @@ class TestLoad(unittest.TestCase):
         self.assertEqual(config.final, "final")
 
         self.assertEqual(
-            [config.measures[i].name for i in range(len(config.measures))],
+            [measure.name for measure in config.measures],
             ["Cost", "Size", "Looks", "Economy", "Power"],
         )
 
         self.assertEqual(
-            [config.measures[i].source for i in range(len(config.measures))],
+            [measure.source for measure in config.measures],
             ["cost", "size", "looks", "economy", "power"],
         )
 
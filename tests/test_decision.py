@@ -3,8 +3,6 @@ Unit tests for fikl.decision.Decision, located in src/fikl/decision.py
 """
 import unittest
 import os
-import yaml
-import pprint
 
 import fikl.decision
 import fikl.config
@@ -13,27 +11,41 @@ import fikl.graph
 
 import pandas as pd
 from pandas.testing import assert_frame_equal, assert_series_equal
-import numpy as np
 import networkx as nx
 
 
 class TestDecision(unittest.TestCase):
     """Tests fikl.decision.DecisionBase"""
 
+    CONFIG_PATHS = [
+        os.path.join(os.path.dirname(__file__), "data", "simple", "simple.yaml"),
+        os.path.join(os.path.dirname(__file__), "data", "simple", "factors.yaml"),
+    ]
+    RAW_PATH = os.path.join(os.path.dirname(__file__), "data", "simple", "simple.csv")
+    # choices in simple.csv, which index every expected table. pandas indexes are immutable, so
+    # the tests can share it.
+    expected_choices = pd.Index(
+        ["one", "two", "three", "four", "five"], dtype="object", name="choice"
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # nothing under test modifies the config or the scorers, so parse and build them once for
+        # all of the tests
+        cls.config = fikl.config.load_yaml(*cls.CONFIG_PATHS)
+        cls.scorer_info = fikl.scorers.get_scorer_info_from_config(cls.config)
+        # the source data is also only read, so the csv only needs to be read once for the tests
+        # that don't test reading it
+        cls.source_data = fikl.decision._get_source_data(cls.config, cls.RAW_PATH)
+        # the tests only read from the decision, so they can all share one
+        cls.decision = fikl.decision.Decision(cls.config, cls.RAW_PATH)
+
     def setUp(self) -> None:
         self.maxDiff = None
-        self.config = fikl.config.load_yaml(
-            os.path.join(os.path.dirname(__file__), "data", "simple", "simple.yaml"),
-            os.path.join(os.path.dirname(__file__), "data", "simple", "factors.yaml"),
-        )
-        self.raw_path = os.path.join(os.path.dirname(__file__), "data", "simple", "simple.csv")
-        self.expected_choices = pd.Index(
-            ["one", "two", "three", "four", "five"], dtype="object", name="choice"
-        )
 
     def test_get_source_data(self) -> None:
         """Tests fikl.decision._get_source_data"""
-        source_data = fikl.decision._get_source_data(self.config, self.raw_path)
+        source_data = fikl.decision._get_source_data(self.config, self.RAW_PATH)
         expected = pd.DataFrame(
             data=[
                 [1.0, 1.0, 1, 1.0, 1.0],
@@ -51,9 +63,7 @@ class TestDecision(unittest.TestCase):
 
     def test_get_measure_data(self) -> None:
         """Tests fikl.decision._get_measure_data"""
-        source_data = fikl.decision._get_source_data(self.config, self.raw_path)
-        scorer_info = fikl.scorers.get_scorer_info_from_config(self.config)
-        measure_data = fikl.decision._get_measure_data(source_data, scorer_info)
+        measure_data = fikl.decision._get_measure_data(self.source_data, self.scorer_info)
         expected = pd.DataFrame(
             data=[
                 [1.0, 0.2, 0.0, 0.2, 0.1],
@@ -83,9 +93,7 @@ class TestDecision(unittest.TestCase):
 
     def test_get_metric_results(self) -> None:
         """Tests fikl.decision._get_metric_results"""
-        source_data = fikl.decision._get_source_data(self.config, self.raw_path)
-        scorer_info = fikl.scorers.get_scorer_info_from_config(self.config)
-        measure_data = fikl.decision._get_measure_data(source_data, scorer_info)
+        measure_data = fikl.decision._get_measure_data(self.source_data, self.scorer_info)
         weights = fikl.decision._get_weights(self.config)
         metric_eval_order = list(nx.topological_sort(fikl.graph.create_graph(self.config)))
         metric_results = fikl.decision._get_metric_results(measure_data, weights, metric_eval_order)
@@ -104,39 +112,37 @@ class TestDecision(unittest.TestCase):
 
     def test_final(self) -> None:
         """Tests fikl.decision.final"""
-        decision = fikl.decision.Decision(self.config, self.raw_path)
         expected = pd.DataFrame(
             data=[0.32916666666666666, 0.4204166666666667, 0.467, 0.55825, 0.6048333333333333],
             index=self.expected_choices,
             columns=["final"],
         )
-        assert_frame_equal(decision.final_table(), expected)
+        assert_frame_equal(self.decision.final_table(), expected)
         assert_frame_equal(
-            decision.final_table(sort=True), expected.sort_values(by="final", ascending=False)
+            self.decision.final_table(sort=True), expected.sort_values(by="final", ascending=False)
         )
 
     def test_answer(self) -> None:
         """Tests fikl.decision.answer"""
-        decision = fikl.decision.Decision(self.config, self.raw_path)
         expected = "five"
-        self.assertEqual(type(decision.answer()), str)
-        self.assertEqual(decision.answer(), expected)
+        self.assertEqual(type(self.decision.answer()), str)
+        self.assertEqual(self.decision.answer(), expected)
 
     def test_scorer_info_source_order(self) -> None:
-        decision = fikl.decision.Decision(self.config, self.raw_path)
-        self.assertEqual([entry.source for entry in decision.scorer_info], decision.sources())
+        self.assertEqual(
+            [entry.source for entry in self.decision.scorer_info], self.decision.sources()
+        )
 
     def test_scorer_info_measure_order(self) -> None:
-        decision = fikl.decision.Decision(self.config, self.raw_path)
-        self.assertEqual([entry.measure for entry in decision.scorer_info], decision.measures())
+        self.assertEqual(
+            [entry.measure for entry in self.decision.scorer_info], self.decision.measures()
+        )
 
     def test_metric_print_order(self) -> None:
-        decision = fikl.decision.Decision(self.config, self.raw_path)
-        self.assertEqual(decision.metric_print_order(), [2, 1, 0])
+        self.assertEqual(self.decision.metric_print_order(), [2, 1, 0])
 
     def test_get_metric_weight_tables(self) -> None:
         """Tests fikl.Decision.metric_weight_tables"""
-        decision = fikl.decision.Decision(self.config, self.raw_path)
         expected = [
             pd.Series(
                 data=[1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0],
@@ -154,7 +160,7 @@ class TestDecision(unittest.TestCase):
                 name="final",
             ),
         ]
-        result = decision.metrics_weight_tables()
+        result = self.decision.metrics_weight_tables()
         self.assertEqual(len(result), len(expected))
-        for i in range(len(result)):
-            assert_series_equal(result[i], expected[i])
+        for result_series, expected_series in zip(result, expected):
+            assert_series_equal(result_series, expected_series)
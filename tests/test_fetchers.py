@@ -2,7 +2,6 @@
 Unit tests for fikl.fetchers module, located in src/fikl/fetchers.py
 """
 import unittest
-import os
 
 import fikl.fetchers
 
@@ -11,25 +11,28 @@ class TestFunction(unittest.TestCase):
     """Just run all the examples in the data folder and make sure they don't crash"""
 
     def test_basic(self) -> None:
-        # get a list of all files in the data folder
+        # get a list of all folders in the data folder
         data_dir = os.path.join(os.path.dirname(__file__), "data")
-        folders = [f for f in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, f))]
+        with os.scandir(data_dir) as entries:
+            folders = sorted(entry.path for entry in entries if entry.is_dir())
         for folder in folders:
-            # consider every yaml part of the overall config
-            config_paths = [
-                os.path.join(data_dir, folder, f)
-                for f in os.listdir(os.path.join(data_dir, folder))
-                if f.endswith(".yaml")
-            ]
-            # should only be a single csv file
-            raw_path = [
-                os.path.join(data_dir, folder, f)
-                for f in os.listdir(os.path.join(data_dir, folder))
-                if f.endswith(".csv")
-            ]
-            self.assertEqual(len(raw_path), 1)
-            raw_path = raw_path[0]
-            config = load_yaml(*config_paths)
-            decision = Decision(config=config, raw_path=raw_path)
-            html = report(decision)
-            # TODO: check that the html is valid
+            # run each example as its own subtest, so that one failing example is reported by name
+            # and doesn't hide the results of the rest
+            with self.subTest(example=os.path.basename(folder)):
+                # consider every yaml part of the overall config. sort out the yaml and csv files
+                # in a single pass over the folder.
+                config_paths = []
+                raw_path = []
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".yaml"):
+                            config_paths.append(entry.path)
+                        elif entry.name.endswith(".csv"):
+                            raw_path.append(entry.path)
+                # should only be a single csv file
+                self.assertEqual(len(raw_path), 1)
+                raw_path = raw_path[0]
+                config = load_yaml(*config_paths)
+                decision = Decision(config=config, raw_path=raw_path)
+                html = report(decision)
+                # TODO: check that the html is valid
@@ -14,9 +14,13 @@ class TestCreateGraph(unittest.TestCase):
         os.path.join(os.path.dirname(__file__), "data", "simple", "factors.yaml"),
     ]
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        # the tests only read the graph, so parse the config and build it once
+        cls.graph = fikl.graph.create_graph(fikl.config.load_yaml(*cls.CONFIG_PATHS))
+
     def setUp(self) -> None:
         self.maxDiff = None
-        self.graph = fikl.graph.create_graph(fikl.config.load_yaml(*self.CONFIG_PATHS))
 
     def test_create_graph(self) -> None:
         self.assertEqual(
@@ -5,10 +5,15 @@ from fikl.html import (
     html_from_doc,
     prettify,
     add_toc,
+    _metrics_weight_chart_svg,
+    _table_to_html,
 )
 
+import re
 import unittest
-from collections import OrderedDict
+
+import bs4
+import pandas as pd
 
 
 class TestHtmlFromDoc(unittest.TestCase):
@@ -120,9 +125,8 @@ class TestHtmlFromDoc(unittest.TestCase):
 
 class TestAddToc(unittest.TestCase):
     """
-    Tests add_toc(), which adds an indented table of contents to an html document. Since random
-    UUIDs are generated for ids where none are provided, we have to specify the expected ids in the
-    test cases.
+    Tests add_toc(), which adds an indented table of contents to an html document. Headings without
+    an id are given numbered ids.
     """
 
     def test_simple(self) -> None:
@@ -189,3 +193,165 @@ class TestAddToc(unittest.TestCase):
         """
         result = prettify(add_toc(html))
         self.assertEqual(result, prettify(expected))
+
+    def test_no_headings(self) -> None:
+        """
+        Tests that a document without headings is returned unchanged, whether or not it is parsed.
+        """
+        html = "<html><body><p>no headings</p></body></html>"
+        self.assertEqual(add_toc(html), html)
+        # looks like it could have a heading, so it gets parsed, but doesn't
+        html = "<html><body><!-- <h1> --><p>no headings</p></body></html>"
+        self.assertEqual(add_toc(html), html)
+        # a fragment that gets parsed is still returned as given, not wrapped in html and body
+        html = "<p>x</p><!-- <h2> --><p>y"
+        self.assertEqual(add_toc(html), html)
+
+    def test_missing_ids(self) -> None:
+        """
+        Tests that headings without an id get unique, numbered ids, and that existing ids are kept.
+        """
+        html = """
+        <html>
+        <body>
+        <h1>Heading 1</h1>
+        <h2 id="heading-2">Heading 2</h2>
+        <h2>Heading 2 Again</h2>
+        </body>
+        </html>
+        """
+        soup = bs4.BeautifulSoup(add_toc(html), "lxml")
+        self.assertEqual(
+            [heading["id"] for heading in soup.find_all(["h1", "h2"])],
+            ["toc_h1", "fikl-h-0", "heading-2", "fikl-h-1"],
+        )
+        self.assertEqual(
+            [a["href"] for a in soup.find(id="toc_div").ul.find_all("a")],
+            ["#fikl-h-0", "#heading-2", "#fikl-h-1"],
+        )
+
+    def test_id_collision(self) -> None:
+        """
+        Tests that numbered ids skip ids which are already used in the document.
+        """
+        soup = bs4.BeautifulSoup(add_toc('<h1>A</h1><h2 id="fikl-h-0">B</h2><h2>C</h2>'), "lxml")
+        self.assertEqual(
+            [heading["id"] for heading in soup.find_all(["h1", "h2"])],
+            ["toc_h1", "fikl-h-1", "fikl-h-0", "fikl-h-2"],
+        )
+        self.assertEqual(
+            [a["href"] for a in soup.find(id="toc_div").ul.find_all("a")],
+            ["#fikl-h-1", "#fikl-h-0", "#fikl-h-2"],
+        )
+
+
+class TestMetricsWeightChartSvg(unittest.TestCase):
+    """
+    Tests _metrics_weight_chart_svg(), which draws a bar chart of factor weights as an svg string.
+    """
+
+    def test_simple(self) -> None:
+        """
+        Tests that there is one bar per factor, labeled with the factor name and percentage, and
+        that the largest weight spans the whole bar area.
+        """
+        svg = _metrics_weight_chart_svg("final", pd.Series([0.75, 0.25], index=["smart", "fun"]))
+        soup = bs4.BeautifulSoup(svg, "html.parser")
+        bars = soup.find_all("rect")
+        self.assertEqual(len(bars), 2)
+        self.assertAlmostEqual(float(bars[1]["width"]) / float(bars[0]["width"]), 1.0 / 3.0)
+        texts = [text.get_text() for text in soup.find_all("text")]
+        self.assertEqual(
+            texts, ["Factor Weighting for Metric: final", "smart", "75%", "fun", "25%"]
+        )
+
+    def test_negative(self) -> None:
+        """
+        Tests that a negative weight is drawn as a bar to the left of a zero line, and that the
+        bars are scaled by the absolute weights.
+        """
+        svg = _metrics_weight_chart_svg("final", pd.Series([0.75, -0.25], index=["smart", "fun"]))
+        soup = bs4.BeautifulSoup(svg, "html.parser")
+        bars = soup.find_all("rect")
+        widths = [float(bar["width"]) for bar in bars]
+        self.assertTrue(all(w > 0 for w in widths))
+        self.assertAlmostEqual(widths[1] / widths[0], 1.0 / 3.0)
+        zero_x = float(soup.line["x1"])
+        self.assertAlmostEqual(float(bars[0]["x"]), zero_x)
+        self.assertAlmostEqual(float(bars[1]["x"]) + widths[1], zero_x)
+        # all negative weights also fill the bar area, to the left of zero
+        svg = _metrics_weight_chart_svg("final", pd.Series([-1.0, -0.5], index=["a", "b"]))
+        soup = bs4.BeautifulSoup(svg, "html.parser")
+        widths = [float(bar["width"]) for bar in soup.find_all("rect")]
+        self.assertAlmostEqual(widths[1] / widths[0], 0.5)
+
+    def test_title(self) -> None:
+        """
+        Tests that the chart has an accessible name.
+        """
+        soup = bs4.BeautifulSoup(
+            _metrics_weight_chart_svg("final", pd.Series([1.0], index=["a"])), "html.parser"
+        )
+        self.assertEqual(soup.svg["role"], "img")
+        self.assertEqual(soup.svg["aria-label"], "Factor Weighting for Metric: final")
+        self.assertEqual(soup.svg.title.get_text(), "Factor Weighting for Metric: final")
+
+    def test_escape(self) -> None:
+        """
+        Tests that names are escaped so they can't break the markup.
+        """
+        svg = _metrics_weight_chart_svg("a<b", pd.Series([1.0], index=["c&d"]))
+        self.assertIn("a&lt;b", svg)
+        self.assertIn("c&amp;d", svg)
+        self.assertNotIn("a<b", svg)
+
+
+class TestTableToHtml(unittest.TestCase):
+    """
+    Tests _table_to_html(), which renders tables without a pandas Styler unless asked to. The output
+    should show the same cells, with the same colors, as the Styler output.
+    """
+
+    def setUp(self) -> None:
+        self.table = pd.DataFrame(
+            {"a": [0.0, 0.25, 0.5], "b": [0.75, 1.0, 0.33]},
+            index=pd.Index(["x", "y", "z"], name="choice"),
+        )
+
+    @staticmethod
+    def _cell_texts(html: str) -> list:
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        return [[td.get_text() for td in tr.find_all("td")] for tr in soup.tbody.find_all("tr")]
+
+    def test_text(self) -> None:
+        """
+        Tests that the cell text matches the Styler output.
+        """
+        for percent in [True, False]:
+            self.assertEqual(
+                self._cell_texts(_table_to_html(self.table, percent=percent)),
+                self._cell_texts(_table_to_html(self.table, percent=percent, legacy=True)),
+            )
+
+    def test_colors(self) -> None:
+        """
+        Tests that the cell colors match the Styler's background gradient, in row major order.
+        """
+        html = _table_to_html(self.table, color_score=True, percent=True)
+        legacy = _table_to_html(self.table, color_score=True, percent=True, legacy=True)
+        pattern = r"background-color: (#[0-9a-f]{6});\s*color: (#[0-9a-f]{6});"
+        self.assertEqual(len(re.findall(pattern, html)), self.table.size)
+        self.assertEqual(re.findall(pattern, html), re.findall(pattern, legacy))
+
+    def test_no_color(self) -> None:
+        """
+        Tests that cells aren't styled when color_score is False.
+        """
+        self.assertNotIn("background-color", _table_to_html(self.table, percent=True))
+
+    def test_empty(self) -> None:
+        """
+        Tests that an empty table renders as nothing.
+        """
+        self.assertEqual(_table_to_html(self.table.iloc[:0], color_score=True), "")
+        self.assertEqual(_table_to_html(pd.Series([], dtype=float), color_score=True), "")
@@ -5,7 +5,17 @@ import unittest
 import pandas as pd
 import numpy as np
 
-from fikl.scorers import Star, Bucket, Relative, Interpolate, Range, Bool, get_scorer_info
+from fikl.scorers import (
+    Star,
+    Bucket,
+    Relative,
+    Interpolate,
+    Range,
+    Bool,
+    ScorerInfo,
+    get_scorer_info,
+    score_all,
+)
 from fikl.proto import config_pb2
 
 
@@ -28,6 +38,19 @@ class TestStar(unittest.TestCase):
             self.scorer(pd.Series([1, 2, 3, 4, 5])).tolist(),
             np.array([0.0, 0.25, 0.50, 0.75, 1.0]).tolist(),
         )
+        # any width of int is fine
+        self.assertEqual(
+            self.scorer(pd.Series([1, 3, 5], dtype="int32")).tolist(),
+            np.array([0.0, 0.50, 1.0]).tolist(),
+        )
+
+    def test_exact_ends(self):
+        """
+        Test that the ends of a scale whose range doesn't divide evenly still score exactly 0 and 1.
+        """
+        scores = Star(min=1, max=7)(pd.Series([1, 4, 7])).tolist()
+        self.assertEqual(scores[0], 0.0)
+        self.assertEqual(scores[-1], 1.0)
 
     def test_outside_range(self):
         """
@@ -58,6 +81,7 @@ class TestStar(unittest.TestCase):
         with self.assertRaises(ValueError):
             Star(min=5, max=1)
 
+    @unittest.skipIf(not __debug__, "the column type isn't checked when running optimized")
     def test_improper_call_types(self) -> None:
         """
         Test that TypeError is raised when the wrong types are passed to the call method
@@ -127,6 +151,33 @@ class TestBucket(unittest.TestCase):
             self.scorer(pd.Series([0.0, 1.0, 2.0, 3.0, 4.0])).tolist(),
             np.array([0.2, 0.4, 0.6, 0.8, 1.0]).tolist(),
         )
+        self.assertEqual(
+            self.scorer(pd.Series([0.5, 4.999, 2.5])).tolist(),
+            np.array([0.2, 1.0, 0.6]).tolist(),
+        )
+
+    def test_outside_range(self):
+        """
+        Test that values outside of the pails, or NaN, raise a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([-0.1]))
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([5.0]))
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([1.0, np.nan]))
+
+    def test_invalid_buckets(self):
+        """
+        Test that no buckets raises a ValueError, and that buckets with missing or unknown keys
+        raise a TypeError.
+        """
+        with self.assertRaises(ValueError):
+            Bucket([])
+        with self.assertRaises(TypeError):
+            Bucket([{"min": 0.0, "max": 1.0}])
+        with self.assertRaises(TypeError):
+            Bucket([{"min": 0.0, "max": 1.0, "val": 0.5, "bogus": 1.0}])
 
     def test_eq(self):
         """
@@ -199,6 +250,18 @@ class TestRelative(unittest.TestCase):
             np.array([1.0, 0.75, 0.50, 0.25, 0.0]).tolist(),
         )
 
+    def test_no_spread(self) -> None:
+        """
+        Test that a column whose values can't be scaled, because they are all the same or include
+        NaN, raises a ValueError.
+        """
+        scorer = Relative(invert=False)
+        with self.assertRaises(ValueError):
+            scorer(pd.Series([2.0, 2.0, 2.0]))
+        with self.assertRaises(ValueError):
+            scorer(pd.Series([1.0, np.nan, 3.0]))
+
+    @unittest.skipIf(not __debug__, "the column type isn't checked when running optimized")
     def test_improper_call_types(self) -> None:
         """
         Test that TypeError is raised when the wrong types are passed to the call method
@@ -246,6 +309,17 @@ class TestInterpolate(unittest.TestCase):
             np.array([0.0, 0.5, 1.0, 0.5, 0.0]).tolist(),
         )
 
+    def test_outside_range(self) -> None:
+        """
+        Test that values outside of the knots, or NaN, raise a ValueError rather than extrapolating.
+        """
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([-1.5, 0.0]))
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([0.0, 1.5]))
+        with self.assertRaises(ValueError):
+            self.scorer(pd.Series([0.0, np.nan]))
+
     def test_eq(self) -> None:
         """
         Test that the __eq__ method works as expected
@@ -317,6 +391,20 @@ class TestRange(unittest.TestCase):
             np.array([1.0, 0.75, 0.50, 0.25, 0.0]).tolist(),
         )
 
+    def test_matches_interpolate(self) -> None:
+        """
+        Test that the straight line Range computes gives the same scores as interpolating between
+        the same two knots.
+        """
+        col = pd.Series(np.linspace(-12.1, 3.7, 101))
+        for worst, best in [(-12.1, 3.7), (3.7, -12.1)]:
+            knots = sorted(
+                [{"in": worst, "out": 0.0}, {"in": best, "out": 1.0}], key=lambda k: k["in"]
+            )
+            np.testing.assert_allclose(
+                Range(worst=worst, best=best)(col), Interpolate(knots)(col), rtol=0, atol=1e-12
+            )
+
     def test_eq(self) -> None:
         """
         Test that the __eq__ method works as expected
@@ -324,6 +412,16 @@ class TestRange(unittest.TestCase):
         self.assertEqual(Range(worst=0.0, best=100.0), Range(worst=0.0, best=100.0))
         self.assertNotEqual(Range(worst=0.0, best=100.0), Range(worst=100.0, best=0.0))
 
+    def test_knots(self) -> None:
+        """
+        Test that the knots are still available as a DataFrame with "in" and "out" columns
+        """
+        knots = Range(worst=0, best=10).knots
+        self.assertIsInstance(knots, pd.DataFrame)
+        self.assertEqual(list(knots.columns), ["in", "out"])
+        self.assertEqual(knots["in"].tolist(), [0.0, 10.0])
+        self.assertEqual(knots["out"].tolist(), [0.0, 1.0])
+
 
 class TestBool(unittest.TestCase):
     """
@@ -351,6 +449,34 @@ class TestBool(unittest.TestCase):
         self.assertNotEqual(Bool(good=False), Bool(good=True))
 
 
+class TestScoreAll(unittest.TestCase):
+    """
+    Unit tests for fikl.scorers.score_all
+    """
+
+    def test_expected(self) -> None:
+        """
+        Test that each measure is scored from its source, with the measures in the order given.
+        """
+        data = pd.DataFrame(
+            {"stars": [1, 3, 5], "good": [True, False, True]}, index=["a", "b", "c"]
+        )
+        scores = score_all(
+            data,
+            [
+                ScorerInfo(measure="Bad", source="good", scorer=Bool(good=False)),
+                ScorerInfo(measure="Stars", source="stars", scorer=Star(min=1, max=5)),
+                ScorerInfo(measure="Good", source="good", scorer=Bool(good=True)),
+            ],
+        )
+        expected = pd.DataFrame(
+            [[0.0, 0.0, 1.0], [1.0, 0.5, 0.0], [0.0, 1.0, 1.0]],
+            index=["a", "b", "c"],
+            columns=["Bad", "Stars", "Good"],
+        )
+        pd.testing.assert_frame_equal(scores, expected)
+
+
 class TestGetScorerInfo(unittest.TestCase):
     def test_star(self) -> None:
         """
@@ -462,3 +588,18 @@ class TestGetScorerInfo(unittest.TestCase):
         self.assertEqual(scorer_info.scorer, Range(worst=0.0, best=100.0))
         self.assertEqual(scorer_info.measure, "name")
         self.assertEqual(scorer_info.source, "source")
+
+    def test_cached(self) -> None:
+        """
+        Test that the same measure gives back the same scorer, and a different one doesn't.
+        """
+
+        def measure(max: int) -> config_pb2.Measure:
+            return config_pb2.Measure(
+                name="name",
+                source="source",
+                scoring=config_pb2.Scoring(star=config_pb2.StarScorerConfig(min=1, max=max)),
+            )
+
+        self.assertIs(get_scorer_info(measure(5)).scorer, get_scorer_info(measure(5)).scorer)
+        self.assertEqual(get_scorer_info(measure(10)).scorer, Star(min=1, max=10))
@@ -1,13 +1,21 @@
 """
 Tests code in src/fikl/util.py.
 """
+import os
+import tempfile
 import unittest
 from collections import OrderedDict
 from numbers import Number
+from unittest import mock
+
+import jinja2
 
 from fikl.util import (
+    _TEMPLATE_DIR,
+    _get_bytecode_cache,
     ensure_type,
     build_ordered_depth_first_tree,
+    load_yaml,
     merge_dicts,
 )
 
@@ -45,6 +53,14 @@ class TestEnsureType(unittest.TestCase):
             ensure_type(1, str, inherit=True)
 
 
+def _ordered(tree: dict) -> OrderedDict:
+    """
+    Recursively convert a tree of dicts to OrderedDicts, so that comparing it to an expected tree
+    also checks the order of the items.
+    """
+    return OrderedDict((key, _ordered(children)) for key, children in tree.items())
+
+
 class TestBuildOrderedDepthFirstTree(unittest.TestCase):
     """
     Tests build_ordered_depth_first_tree().
@@ -66,7 +82,7 @@ class TestBuildOrderedDepthFirstTree(unittest.TestCase):
                 ("C", OrderedDict()),
             ]
         )  # type: ignore
-        self.assertEqual(build_ordered_depth_first_tree(items, levels), expected)
+        self.assertEqual(_ordered(build_ordered_depth_first_tree(items, levels)), expected)
 
     def test_nest(self) -> None:
         items = ["a", "b", "c"]
@@ -76,7 +92,7 @@ class TestBuildOrderedDepthFirstTree(unittest.TestCase):
                 ("a", OrderedDict([("b", OrderedDict([("c", OrderedDict())]))])),
             ]
         )  # type: ignore
-        self.assertEqual(build_ordered_depth_first_tree(items, levels), expected)
+        self.assertEqual(_ordered(build_ordered_depth_first_tree(items, levels)), expected)
 
     def test_complicated(self) -> None:
         """
@@ -106,7 +122,71 @@ class TestBuildOrderedDepthFirstTree(unittest.TestCase):
                 ("I", OrderedDict()),
             ]
         )
-        self.assertEqual(build_ordered_depth_first_tree(items, levels), expected)
+        self.assertEqual(_ordered(build_ordered_depth_first_tree(items, levels)), expected)
+
+    def test_single(self) -> None:
+        """
+        Tests an outline with a single item.
+        """
+        self.assertEqual(
+            _ordered(build_ordered_depth_first_tree(["A"], [0])),
+            OrderedDict([("A", OrderedDict())]),
+        )
+
+    def test_invalid_levels(self) -> None:
+        """
+        Tests that skipped, negative, or non-zero starting levels are rejected.
+        """
+        with self.assertRaises(ValueError):
+            build_ordered_depth_first_tree(["A", "B"], [0, 2])
+        with self.assertRaises(ValueError):
+            build_ordered_depth_first_tree(["A", "B"], [0, -1])
+        with self.assertRaises(ValueError):
+            build_ordered_depth_first_tree(["A", "B"], [1, 2])
+        with self.assertRaises(ValueError):
+            build_ordered_depth_first_tree(["A", "B"], [0])
+
+
+class TestGetBytecodeCache(unittest.TestCase):
+    """
+    Tests _get_bytecode_cache(), which caches compiled templates on disk when it can, and falls
+    back to no cache when it can't.
+    """
+
+    def test_unsafe_dir(self) -> None:
+        """
+        Tests that there is no cache when jinja can't find a safe cache directory.
+        """
+        with mock.patch.object(
+            jinja2.FileSystemBytecodeCache,
+            "_get_default_cache_dir",
+            side_effect=RuntimeError("Cannot determine safe temp directory."),
+        ):
+            self.assertIsNone(_get_bytecode_cache())
+
+    def test_unwritable_dir(self) -> None:
+        """
+        Tests that templates still render when the cache directory can't be read or written.
+        """
+        cache = _get_bytecode_cache()
+        self.assertIsNotNone(cache)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache.directory = os.path.join(tmp_dir, "missing")  # type: ignore
+            env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(_TEMPLATE_DIR), bytecode_cache=cache
+            )
+            html = env.get_template("table.html.j2").render(index_name="", columns=[], rows=[])
+            self.assertIn("<table", html)
+
+
+class TestLoadYaml(unittest.TestCase):
+    """Tests load_yaml, which loads YAML with aliases expanded into copies."""
+
+    def test_aliases(self) -> None:
+        data = load_yaml("a: &anchor\n  b: [1, 2]\nc: *anchor\n")
+        self.assertEqual(data, {"a": {"b": [1, 2]}, "c": {"b": [1, 2]}})
+        self.assertIsNot(data["a"], data["c"])
+        self.assertIsNot(data["a"]["b"], data["c"]["b"])
 
 
 class TestMergeDicts(unittest.TestCase):